@@ -1,8 +1,7 @@
 """Main entry point for the priv-goals application."""
 
 import sys
-import gradio as gr
-from typing import NoReturn, Tuple
+from typing import TYPE_CHECKING, NoReturn, Tuple
 import argparse
 
 from .app import create_app
@@ -11,7 +10,10 @@ from .exceptions import ConfigurationError
 from .utils.args_parser import ArgsParser
 from .utils.logger import Logger
 
-def setup_application() -> Tuple[Logger, gr.Blocks, argparse.Namespace]:
+if TYPE_CHECKING:
+    import gradio as gr
+
+def setup_application() -> Tuple[Logger, "gr.Blocks", argparse.Namespace]:
     """Initialize application components.
     
     Returns:
@@ -1,19 +1,186 @@
 """Core application module for priv-goals."""
 
-import json
-import gradio as gr
+import atexit
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Any, Generator, Iterator, List, Optional, Tuple
 
+import httpx
 import litellm
-from litellm import completion
 
+try:
+    # Optional C-accelerated JSON decoder for tool-call arguments
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+from priv_goals.llm_client import LLMClient
 from priv_goals.storage.goal import Goal
 from priv_goals.utils.logger import Logger
 
 from .storage import GoalStorage, CSVStorage, GoogleSheetsStorage
 from .constants import HEADER_NAMES, SYSTEM_MESSAGE, WELCOME_MESSAGE, TOOLS
 
+if TYPE_CHECKING:
+    # Imported lazily in create_interface; gradio is only needed to serve the UI
+    import gradio as gr
+
+# Connection pool shared by every litellm completion call
+HTTP_MAX_CONNECTIONS = 64
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
+# Idle connections outlive the pause between chat turns (httpx defaults to 5s)
+HTTP_KEEPALIVE_EXPIRY = 60.0
+HTTP_TIMEOUT = 60
+
+# Lifetime in seconds of exact-match completion cache entries
+LLM_CACHE_TTL = 600
+
+# User turns kept in the conversation sent to the LLM; older turns are dropped
+MAX_HISTORY_TURNS = 20
+
+# Tools whose output can be shown to the user as-is. A turn made of a single
+# call to one of these is answered without a second completion request.
+READ_ONLY_TOOLS = frozenset({"view_goals"})
+
+# First line of a view_goals result that lists goals; empty and error results lack it
+GOALS_CSV_HEADER = ",".join(HEADER_NAMES)
+
+# Tools that change stored goals; the goals table is reloaded only after these
+MUTATING_TOOLS = frozenset({"log_goal", "mark_goal_complete", "delete_goal", "update_goal_fields"})
+
+def _configure_http_client() -> httpx.Client:
+    """Install a persistent HTTP connection pool for litellm.
+
+    Without this, litellm may open a fresh TCP+TLS connection for each
+    completion, so a chat turn with a tool call pays for two handshakes.
+
+    Returns:
+        The shared ``httpx.Client`` used by litellm.
+    """
+    if isinstance(litellm.client_session, httpx.Client):
+        return litellm.client_session
+
+    client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        ),
+        timeout=HTTP_TIMEOUT
+    )
+    litellm.client_session = client
+    atexit.register(client.close)
+    return client
+
+def _prewarm_connection(client: httpx.Client, api_base: str, logger: Logger) -> None:
+    """Open a pooled connection to the LLM provider in the background.
+
+    Moves the TCP+TLS handshake off the user's first chat turn. The request
+    carries no credentials and its response is ignored.
+
+    Args:
+        client: Shared HTTP client used by litellm
+        api_base: Base URL of the LLM provider
+        logger: Logger instance
+    """
+    def warm() -> None:
+        try:
+            client.head(api_base)
+        except httpx.HTTPError as e:
+            logger.debug(f"Connection pre-warm to {api_base} failed: {e}")
+
+    threading.Thread(target=warm, name="priv-goals-prewarm", daemon=True).start()
+
+# Tool name -> handler taking the storage backend and the parsed arguments
+_TOOL_HANDLERS: Dict[str, Callable[[GoalStorage, Dict[str, Any]], Any]] = {
+    "log_goal": lambda storage, args: storage.log_goal(args["goal"]),
+    "view_goals": lambda storage, _: storage.view_goals_formatted()[2],
+    "mark_goal_complete": lambda storage, args: storage.mark_goal_complete(Goal.from_raw(args["goal"])),
+    "delete_goal": lambda storage, args: storage.delete_goal(Goal.from_raw(args["goal"])),
+    "update_goal_fields": lambda storage, args: storage.update_goal_fields(Goal.from_raw(args["goal"]), args["updates"])
+}
+
+# Tool name -> argument names its schema marks as required
+_REQUIRED_ARGS: Dict[str, Tuple[str, ...]] = {
+    tool["function"]["name"]: tuple(tool["function"]["parameters"].get("required", ()))
+    for tool in TOOLS
+}
+
+# Tool name -> JSON schema type declared for each of its arguments
+_ARG_TYPES: Dict[str, Dict[str, str]] = {
+    tool["function"]["name"]: {
+        arg: schema.get("type") for arg, schema in tool["function"]["parameters"].get("properties", {}).items()
+    }
+    for tool in TOOLS
+}
+
+# JSON schema type -> (check for a decoded argument value, description used in errors)
+_ARG_TYPE_CHECKS: Dict[str, Tuple[Callable[[Any], bool], str]] = {
+    "string": (lambda value: isinstance(value, str) and bool(value.strip()), "a non-empty string"),
+    "object": (lambda value: isinstance(value, dict), "an object"),
+}
+
+def parse_tool_arguments(name: str, arguments: str) -> Dict[str, Any]:
+    """Decode and check the JSON arguments of a tool call.
+
+    Args:
+        name: Name of the called tool
+        arguments: JSON-encoded arguments produced by the LLM
+
+    Returns:
+        The decoded arguments
+
+    Raises:
+        ValueError: If the arguments are not a JSON object, lack a required
+            argument, or have a value that does not match its declared type
+    """
+    args = _json.loads(arguments or "{}")
+    if not isinstance(args, dict):
+        raise ValueError("arguments must be a JSON object")
+
+    missing = [arg for arg in _REQUIRED_ARGS.get(name, ()) if arg not in args]
+    if missing:
+        raise ValueError(f"missing required arguments: {', '.join(missing)}")
+
+    declared_types = _ARG_TYPES.get(name, {})
+    for arg, value in args.items():
+        check = _ARG_TYPE_CHECKS.get(declared_types.get(arg))
+        if check is not None and not check[0](value):
+            raise ValueError(f"{arg} must be {check[1]}")
+    return args
+
+def should_refresh_goals(messages: List[Dict[str, Any]]) -> bool:
+    """Check whether the latest turn called a tool that changes stored goals.
+
+    Args:
+        messages: The conversation history, ending with the latest turn
+
+    Returns:
+        True if any tool call since the most recent user message is in
+        ``MUTATING_TOOLS``
+    """
+    for message in reversed(messages):
+        if message["role"] == "user":
+            return False
+        if message["role"] == "assistant" and message.get("tool_calls"):
+            if any(tc["function"]["name"] in MUTATING_TOOLS for tc in message["tool_calls"]):
+                return True
+    return False
+
+def trim_history(messages: List[Dict[str, Any]], max_turns: int = MAX_HISTORY_TURNS) -> None:
+    """Drop the oldest turns so the conversation holds at most ``max_turns`` user messages.
+
+    The system message is kept. Turns are cut at user-message boundaries, so
+    no tool result is separated from the assistant message that requested it.
+
+    Args:
+        messages: The conversation history, trimmed in place
+        max_turns: Number of most recent user turns to keep
+    """
+    user_positions = [i for i, message in enumerate(messages) if message["role"] == "user"]
+    if len(user_positions) > max_turns:
+        del messages[1:user_positions[-max_turns]]
+
 class PrivGoalsApp:
     """Main application class for priv-goals."""
     
@@ -26,110 +193,198 @@ class PrivGoalsApp:
             logger: Logger instance
         """
         self.storage = storage
-        self.llm_config = llm_config
-        self.messages = [SYSTEM_MESSAGE]
-        
-        # Update system message with initial goals
-        initial_goals = storage.view_goals_formatted()[2]
-        self.messages[0]["content"] += f"\n\nInitial goals:\n\n{initial_goals}"
+        self.llm = LLMClient(
+            model=llm_config["model"],
+            api_key=llm_config["api_key"],
+            api_base=llm_config["api_base"],
+            tools=TOOLS
+        )
+        # Build the system message with initial goals on a copy, so the shared
+        # SYSTEM_MESSAGE constant is not extended every time an app is created
+        # Fetched once here and reused to populate the goals table in create_interface
+        self._initial_goals = storage.view_goals_formatted()
+        system_message = {
+            "role": "system",
+            "content": f"{SYSTEM_MESSAGE['content']}\n\nInitial goals:\n\n{self._initial_goals[2]}"
+        }
+
+        # Starting point for every conversation; each session works on a copy
+        self.messages = [system_message]
         
-        self.completion = self._completion
         self.logger = logger
     
-    def _completion(self, **args):
-        return completion(
-            model=self.llm_config["model"],
-            api_key=self.llm_config["api_key"],
-            api_base=self.llm_config["api_base"],
-            **args
-        )
-    
-    def call_function(self, name: str, args: dict) -> str:
-        """Execute the appropriate tool function based on the name."""
-        self.logger.info(f"Tool call: {name} with args: {args}")
-        functions = {
-            "log_goal": lambda args: self.storage.log_goal(Goal(args["goal"])),
-            "view_goals": lambda _: self.storage.view_goals_formatted()[2],
-            "mark_goal_complete": lambda args: self.storage.mark_goal_complete(Goal(args["goal"])),
-            "delete_goal": lambda args: self.storage.delete_goal(Goal(args["goal"])),
-            # TODO: Debug this tool
-            "update_goal_fields": lambda args: self.storage.update_goal_fields(args["goal"], args["updates"])
-        }
+    def call_function(self, name: str, args: dict, storage: Optional[GoalStorage] = None) -> str:
+        """Execute the appropriate tool function based on the name.
 
-        if name not in functions:
+        ``storage`` defaults to the app's storage; pass the handle from
+        ``batched_writes`` to defer the call's writes with the rest of the turn.
+        """
+        self.logger.info(f"Tool call: {name} with args: {args}")
+        handler = _TOOL_HANDLERS.get(name)
+        if handler is None:
             raise ValueError(f"Unknown function: {name}")
 
-        return functions[name](args)
+        return handler(storage or self.storage, args)
+
+    def execute_tool_calls(self, tool_calls: List[Any]) -> List[str]:
+        """Execute the tool calls of one assistant turn.
+
+        Calls run one after another in the order the model issued them, since
+        later calls may depend on earlier ones (e.g. logging a goal and then
+        updating it). The backend may still coalesce the turn's writes.
+
+        Args:
+            tool_calls: Tool calls from the LLM response message
+
+        Returns:
+            Tool results, in the same order as ``tool_calls``. A call that
+            fails, or whose deferred writes fail to save, gets an error
+            message as its result, so every call still has a reply.
+        """
+        def run(storage: GoalStorage, tool_call: Any) -> str:
+            name = tool_call.function.name
+            try:
+                function_args = parse_tool_arguments(name, tool_call.function.arguments)
+            except ValueError as e:
+                # Report malformed arguments back to the model instead of failing the turn
+                self.logger.warning(f"Invalid arguments for tool {name}: {e}")
+                return f"Invalid arguments for {name}: {e}"
+            try:
+                return str(self.call_function(name, function_args, storage))
+            except Exception as e:
+                # Every tool call needs a result message, or later completions are rejected
+                self.logger.error(f"Tool {name} failed: {e}")
+                return f"Error in {name}: {e}"
+
+        # Let the backend coalesce the turn's writes into as few requests as it can
+        try:
+            with self.storage.batched_writes() as storage:
+                return [run(storage, tool_call) for tool_call in tool_calls]
+        except Exception as e:
+            # The calls ran but their deferred writes were not saved
+            self.logger.error(f"Failed to save tool call changes: {e}")
+            return [f"Error in {tool_call.function.name}: changes could not be saved: {e}" for tool_call in tool_calls]
+
+    def _stream_completion(self, messages: List[Dict[str, Any]]) -> Generator[str, None, Any]:
+        """Stream a completion for the given conversation.
+
+        Yields:
+            The response content accumulated so far, each time it grows
+
+        Returns:
+            The complete response message, including any tool calls
+        """
+        chunks = []
+        content = ""
+        for chunk in self.llm.complete(messages, stream=True):
+            chunks.append(chunk)
+            delta = chunk.choices[0].delta.content
+            if delta:
+                content += delta
+                yield content
+
+        response = litellm.stream_chunk_builder(chunks, messages=messages)
+        return response.choices[0].message
+
+    def stream_chat_with_llm(self, user_message: str, messages: List[Dict[str, Any]]) -> Iterator[str]:
+        """Handle interaction with the LLM, streaming the reply as it arrives.
+
+        Tool calls are collected from the first streamed response and executed
+        before the final reply is streamed. A turn consisting of a single
+        read-only tool call that listed goals is answered with the tool output
+        directly.
+
+        Args:
+            user_message: The user's chat message
+            messages: The conversation history. It is mutated: the user
+                message, tool calls, tool results and the final reply are
+                appended in place, and turns beyond ``MAX_HISTORY_TURNS`` are
+                dropped. If the turn fails, the messages it added are removed.
+
+        Yields:
+            The assistant reply accumulated so far
+        """
+        # Add user message to messages, dropping turns beyond the history cap
+        messages.append({"role": "user", "content": user_message})
+        trim_history(messages)
+        turn_start = len(messages) - 1
 
-    def chat_with_llm(self, user_message: str) -> Tuple[str, List[Dict[str, Any]]]:
-        """Handle interaction with the LLM and process tool calls."""
         try:
-            # Add user message to messages
-            self.messages.append({"role": "user", "content": user_message})
-            
             # Get initial response
-            response = self.completion(
-                messages=self.messages,
-                tools=TOOLS
-            )
-            
-            response_message = response.choices[0].message
+            response_message = yield from self._stream_completion(messages)
             self.logger.info(f"LLM response: {response_message}")
             
             # Handle tool calls if present
             if response_message.tool_calls:
-                # Process tool calls
-                self.messages.append({
+                # Execute tool calls, then record them with their results in
+                # request order
+                results = self.execute_tool_calls(response_message.tool_calls)
+                messages.append({
                     "role": "assistant",
                     "content": None,
-                    "tool_calls": [
-                        {
-                            "id": tool_call.id,
-                            "type": "function",
-                            "function": {
-                                "name": tool_call.function.name,
-                                "arguments": tool_call.function.arguments
-                            }
-                        }
-                        for tool_call in response_message.tool_calls
-                    ]
+                    "tool_calls": [tool_call.model_dump() for tool_call in response_message.tool_calls]
                 })
-
-                # Execute each tool call
-                for tool_call in response_message.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-                    function_response = self.call_function(function_name, function_args)
-                    
-                    self.messages.append({
+                for tool_call, function_response in zip(response_message.tool_calls, results):
+                    messages.append({
                         "role": "tool",
                         "tool_call_id": tool_call.id,
-                        "name": function_name,
-                        "content": str(function_response)
+                        "name": tool_call.function.name,
+                        "content": function_response
                     })
 
-                # Get final response
-                final_response = self.completion(
-                    messages=self.messages,
-                    tools=TOOLS
-                )
-                return final_response.choices[0].message.content, self.messages
-            else:
-                return response_message.content, self.messages
-                
+                # A lone read-only call that listed goals needs no summarizing
+                # round-trip; empty and error results are left to the model.
+                if (
+                    len(results) == 1
+                    and response_message.tool_calls[0].function.name in READ_ONLY_TOOLS
+                    and results[0].startswith(GOALS_CSV_HEADER)
+                ):
+                    reply = f"Here are your current goals:\n\n```\n{results[0]}\n```"
+                    messages.append({"role": "assistant", "content": reply})
+                    yield reply
+                    return
+
+                # Stream final response
+                response_message = yield from self._stream_completion(messages)
+
+            messages.append({"role": "assistant", "content": response_message.content or ""})
+
         except Exception as e:
             self.logger.error(f"Error during chat interaction: {e}")
-            return "An error occurred. Please try again.", self.messages
+            # Drop the partial turn so the history stays valid for the next request
+            del messages[turn_start:]
+            yield "An error occurred. Please try again."
+
+    def chat_with_llm(
+        self,
+        user_message: str,
+        messages: Optional[List[Dict[str, Any]]] = None
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Handle interaction with the LLM and process tool calls.
+
+        Args:
+            user_message: The user's chat message
+            messages: The conversation history to extend; defaults to the
+                application's own conversation
+        """
+        if messages is None:
+            messages = self.messages
+        reply = ""
+        for reply in self.stream_chat_with_llm(user_message, messages):
+            pass
+        return reply, messages
 
-    def create_interface(self) -> gr.Blocks:
+    def create_interface(self) -> "gr.Blocks":
         """Create and configure the Gradio interface."""
+        import gradio as gr
+
         with gr.Blocks(title="PRIV Goals") as interface:
             with gr.Row():
                 # Goals display
                 goals_dataframe = gr.Dataframe(
                     headers=HEADER_NAMES,
                     label="Your Goals",
-                    value=self.storage.view_goals_formatted()[0],
+                    value=self._initial_goals[0],
                     interactive=False,
                     wrap=True
                 )
@@ -149,36 +404,57 @@ class PrivGoalsApp:
                 )
                 submit_button = gr.Button("Submit", scale=1)
 
-            def interact(user_message: str, history: List) -> Tuple[List, str, List]:
+            # Per-session conversation history; Gradio copies the initial
+            # value for each browser session. stream_chat_with_llm extends the
+            # list in place, so it never needs to be returned as an output.
+            session_messages = gr.State(self.messages)
+            # Rows currently shown in this session's goals table, also updated in place
+            shown_goals = gr.State(self._initial_goals[0])
+
+            def interact(
+                user_message: str,
+                history: List,
+                messages: List[Dict[str, Any]],
+                shown: List[List[str]]
+            ) -> Iterator[Tuple[List, str, Any]]:
                 self.logger.info(f"User message: {user_message}")
                 
-                # Get response from LLM
-                response, _ = self.chat_with_llm(user_message)
-                
-                # Update chat history
-                history.append((user_message, response))
-                
-                # Update goals display
-                updated_goals = self.storage.view_goals_formatted()[0]
+                # Stream the response from the LLM into the chat history
+                history.append((user_message, ""))
+                for partial_response in self.stream_chat_with_llm(user_message, messages):
+                    history[-1] = (user_message, partial_response)
+                    yield history, "", gr.update()
                 
-                return history, "", updated_goals
+                # Update goals display, skipping the reload when nothing changed
+                # and the re-render when the reloaded rows match what is shown
+                if should_refresh_goals(messages):
+                    rows = self.storage.view_goals_formatted()[0]
+                    if rows != shown:
+                        shown[:] = rows
+                        yield history, "", rows
+                        return
+                yield history, "", gr.update()
 
-            # Connect interface components
+            # Connect interface components. The reply streams into the chatbot,
+            # so a minimal indicator replaces the overlay that would otherwise
+            # cover the goals table for the whole turn.
             submit_button.click(
                 interact,
-                inputs=[input_box, chatbot],
-                outputs=[chatbot, input_box, goals_dataframe]
+                inputs=[input_box, chatbot, session_messages, shown_goals],
+                outputs=[chatbot, input_box, goals_dataframe],
+                show_progress="minimal"
             )
             
             input_box.submit(
                 interact,
-                inputs=[input_box, chatbot],
-                outputs=[chatbot, input_box, goals_dataframe]
+                inputs=[input_box, chatbot, session_messages, shown_goals],
+                outputs=[chatbot, input_box, goals_dataframe],
+                show_progress="minimal"
             )
 
         return interface
 
-def create_app(config: Dict[str, Any], debug: bool = False) -> gr.Blocks:
+def create_app(config: Dict[str, Any], debug: bool = False) -> "gr.Blocks":
     """Create and configure the application.
     
     Args:
@@ -197,6 +473,14 @@ def create_app(config: Dict[str, Any], debug: bool = False) -> gr.Blocks:
     if (debug):
         litellm._turn_on_debug()
 
+    http_client = _configure_http_client()
+    if config.get("api_base"):
+        _prewarm_connection(http_client, config["api_base"], logger)
+
+    # Exact-match, in-process response cache. The key covers the whole message
+    # list, so a hit is only possible for an identical conversation state.
+    litellm.cache = litellm.Cache(type="local", ttl=LLM_CACHE_TTL)
+
     # Initialize storage backend
     if config["storage_type"] == "csv":
         storage = CSVStorage(Path.home() / ".priv-goals" / "goals.csv")
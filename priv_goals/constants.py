@@ -6,6 +6,8 @@ DEFAULT_LOG_DIR = Path.home() / ".priv-goals" / "logs"
 
 # Storage constants
 HEADER_NAMES = ["Goal", "Status", "Created At", "Completed At", "Duration", "Expected Duration", "Notes"]
+# Format of the "Created At" and "Completed At" columns
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 # System prompts
 SYSTEM_MESSAGE = {
@@ -0,0 +1,58 @@
+"""LLM completion client for priv-goals."""
+
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from litellm import completion
+
+
+@dataclass
+class LLMClient:
+    """Completion client bound to a single model configuration.
+
+    The client holds no per-conversation state, so one instance can be shared
+    by every Gradio session and worker thread. Conversation history is passed
+    in explicitly on each call.
+
+    Attributes:
+        model: Model identifier passed to litellm
+        api_key: API key for the provider (None for providers such as Ollama)
+        api_base: Base URL of the provider's API
+        tools: Tool definitions offered to the model on every request
+
+    Example:
+        >>> llm = LLMClient(model="gpt-4", api_key="sk-...", api_base="https://api.openai.com/v1", tools=TOOLS)
+        >>> response = llm.complete([{"role": "user", "content": "Hello"}])
+    """
+
+    model: str
+    api_key: Optional[str] = field(default=None, repr=False)
+    api_base: Optional[str] = None
+    tools: Optional[List[Dict[str, Any]]] = field(default=None, repr=False)
+    _complete: Callable[..., Any] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Bind everything that is constant across calls once, including the
+        # tool schema, instead of rebuilding the kwargs on every request.
+        bound: Dict[str, Any] = {
+            "model": self.model,
+            "api_key": self.api_key,
+            "api_base": self.api_base,
+            "caching": True,
+        }
+        if self.tools:
+            bound["tools"] = self.tools
+        self._complete = partial(completion, **bound)
+
+    def complete(self, messages: List[Dict[str, Any]], **kwargs: Any) -> Any:
+        """Request a completion for the given conversation.
+
+        Args:
+            messages: Conversation history in OpenAI message format
+            **kwargs: Additional litellm completion arguments
+
+        Returns:
+            The litellm response (or stream, if ``stream=True``)
+        """
+        return self._complete(messages=messages, **kwargs)
@@ -2,10 +2,20 @@ import csv
 from datetime import datetime
 import logging
 import os
-from typing import Dict, List, Tuple
-from priv_goals.constants import HEADER_NAMES
-from priv_goals.storage.goal_storage import GoalStorage
-from priv_goals.storage.goal import Goal
+from operator import itemgetter
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from priv_goals.constants import HEADER_NAMES, TIMESTAMP_FORMAT
+from priv_goals.storage.goal_storage import GoalStorage, synchronized
+from priv_goals.storage.goal import Goal, goal_key
+
+logger = logging.getLogger(__name__)
+
+# Extracts a row's values in HEADER_NAMES order
+_GET_FIELDS = itemgetter(*HEADER_NAMES)
 
 # TODO/FIXME: Use consistent typing (Goal vs. str) for goal arguments
 
@@ -16,8 +26,10 @@ class CSVStorage(GoalStorage):
     Handles file creation, reading, writing, and maintains proper CSV formatting
     and header structure.
 
-    The implementation is synchronous and involves file I/O for all operations.
-    Consider file locking for multi-process scenarios.
+    Goals are kept in memory and the file is only read again when it changes
+    on disk. New goals are appended to the file; edits and deletions rewrite
+    it from the in-memory rows. Consider file locking for multi-process
+    scenarios.
 
     Attributes:
         csv_path (str): Path to the CSV storage file.
@@ -29,8 +41,9 @@ class CSVStorage(GoalStorage):
 
     Note:
         - Creates CSV with headers if file doesn't exist
-        - All operations are atomic file reads/writes
-        - No built-in concurrency control
+        - Rewrites replace the file atomically; appends add a single line
+        - Operations are serialized with a per-instance lock; there is no
+          cross-process file locking
     """
 
     def __init__(self, csv_path: str):
@@ -47,31 +60,138 @@ class CSVStorage(GoalStorage):
             >>> storage = CSVStorage("~/.priv_goals/goals.csv")
         """
         self.csv_path = os.path.expanduser(csv_path)
+        self._lock = threading.Lock()
+        self._goals: List[Dict] = []
+        # Maps goal keys (case-folded sanitized names) to their position in self._goals
+        self._index: Dict[str, int] = {}
+        # Keys shared by several rows, e.g. 'Read' and 'read' logged before
+        # names were matched case-insensitively
+        self._ambiguous_keys: Set[str] = set()
+        # (mtime, size) of the file when self._goals was last synchronized
+        self._file_signature: Optional[Tuple[int, int]] = None
         self._ensure_csv_file()
 
     def _ensure_csv_file(self) -> None:
         """Creates the CSV file with headers if it does not exist."""
-        if not os.path.exists(self.csv_path):
-            with open(self.csv_path, mode="w", newline="") as file:
+        try:
+            # Exclusive create: never truncates a file another process just made
+            with open(self.csv_path, mode="x", newline="") as file:
                 writer = csv.writer(file)
                 writer.writerow(HEADER_NAMES)
+        except FileExistsError:
+            pass
+
+    def _reindex(self) -> None:
+        """Rebuilds the goal-name -> position index from the in-memory rows."""
+        self._index = {}
+        self._ambiguous_keys = set()
+        for row_idx, row in enumerate(self._goals):
+            key = goal_key(row["Goal"])
+            if key in self._index:
+                self._ambiguous_keys.add(key)
+            else:
+                self._index[key] = row_idx
+
+    def _find_row(self, goal_name: str) -> Optional[int]:
+        """Returns the position of the named goal in the loaded rows, if present.
+
+        Names are matched case-insensitively, except that a row stored under
+        exactly ``goal_name`` wins when several rows differ only in case.
+        """
+        self._load_goals()
+        key = goal_key(goal_name)
+        if key in self._ambiguous_keys:
+            for row_idx, row in enumerate(self._goals):
+                if row["Goal"] == goal_name:
+                    return row_idx
+        return self._index.get(key)
+
+    def _stat_signature(self) -> Optional[Tuple[int, int]]:
+        """Returns the file's (mtime, size), or None if it does not exist."""
+        try:
+            stat = os.stat(self.csv_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
 
     def _load_goals(self) -> List[Dict]:
-        """Loads goals from the CSV file into a list of dictionaries."""
-        if not os.path.exists(self.csv_path):
-            return []
-
-        with open(self.csv_path, mode="r", newline="") as file:
-            reader = csv.DictReader(file)
-            return list(reader)
-
-    def _save_goals(self, data: List[dict]) -> None:
-        """Writes updated goal data back to the CSV file."""
-        with open(self.csv_path, mode="w", newline="") as file:
-            writer = csv.DictWriter(file, fieldnames=HEADER_NAMES)
-            writer.writeheader()
-            writer.writerows(data)
-
+        """Returns the in-memory goal rows, reloading them if the file changed on disk."""
+        signature = self._stat_signature()
+        if signature is None:
+            self._goals, self._file_signature = [], None
+            self._reindex()
+        elif signature != self._file_signature:
+            with open(self.csv_path, mode="r", newline="") as file:
+                self._goals = list(csv.DictReader(file))
+            self._file_signature = signature
+            self._reindex()
+        return self._goals
+
+    def _save_goals(self) -> None:
+        """Writes the in-memory goal rows back to the CSV file.
+
+        The rows are written to a uniquely named temporary file next to the
+        CSV, which then replaces it, so a crash mid-write never leaves a
+        truncated file. The temporary file takes the CSV's permissions, so a
+        rewrite does not widen access to the goals.
+        """
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.csv_path)),
+            prefix=f"{os.path.basename(self.csv_path)}.",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, mode="w", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=HEADER_NAMES)
+                writer.writeheader()
+                writer.writerows(self._goals)
+                file.flush()
+                os.fsync(file.fileno())
+            try:
+                shutil.copymode(self.csv_path, tmp_path)
+            except FileNotFoundError:
+                # The CSV was removed; keep mkstemp's owner-only permissions
+                pass
+            os.replace(tmp_path, self.csv_path)
+        except Exception:
+            # Memory and disk may now disagree; force a reload on next access.
+            self._file_signature = None
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._file_signature = self._stat_signature()
+        self._reindex()
+
+    def _append_row(self, row: Dict) -> None:
+        """Appends a single goal row without rewriting the rest of the file."""
+        if self._file_signature is None:
+            # The file was removed since it was last read; start a new one with
+            # the header so the appended row can be read back.
+            self._ensure_csv_file()
+        try:
+            with open(self.csv_path, mode="a", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=HEADER_NAMES)
+                writer.writerow(row)
+                file.flush()
+                os.fsync(file.fileno())
+        except Exception:
+            self._file_signature = None
+            raise
+        self._goals.append(row)
+        self._index.setdefault(goal_key(row["Goal"]), len(self._goals) - 1)
+        self._file_signature = self._stat_signature()
+
+    def _rewrite_row(self, row_idx: int, new_row: Dict) -> None:
+        """Replaces the goal row at ``row_idx`` and persists the change."""
+        self._goals[row_idx] = new_row
+        self._save_goals()
+
+    def _delete_row(self, row_idx: int) -> None:
+        """Removes the goal row at ``row_idx`` and persists the change."""
+        del self._goals[row_idx]
+        self._save_goals()
+
+    @synchronized
     def log_goal(self, goal: str) -> str:
         """
         Logs a new goal into the system if it does not already exist.
@@ -90,15 +210,13 @@ class CSVStorage(GoalStorage):
             - The method checks for duplicates before logging the new goal.
             - The goal is stored with a status of "Pending" and a timestamp of when it was created.
         """
-        goal_obj = Goal(goal)  # Convert raw string to `Goal`
-        data = self._load_goals()
-
+        goal_obj = Goal.from_raw(goal)  # Convert raw string to `Goal`
         # TODO: Identifying duplicates should be handled by the assistant
-        if any(row["Goal"] == goal_obj.sanitized_name for row in data):
+        if self._find_row(goal_obj.sanitized_name) is not None:
             return f"Goal '{goal_obj.display_name}' already exists!" 
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        data.append({
+        timestamp = time.strftime(TIMESTAMP_FORMAT)
+        self._append_row({
             "Goal": goal_obj.sanitized_name,
             "Status": "Pending",
             "Created At": timestamp,
@@ -108,9 +226,9 @@ class CSVStorage(GoalStorage):
             "Notes": ""
         })
 
-        self._save_goals(data)
         return f"Goal '{goal_obj.display_name}' logged successfully!"
 
+    @synchronized
     def view_goals_formatted(self) -> Tuple[List[List[str]], List[str], str]:
         """
         Fetches and formats the goals data.
@@ -137,17 +255,18 @@ class CSVStorage(GoalStorage):
             if not data:
                 return [], [], "No goals found."
 
-            formatted_data = [[row[header_name] for header_name in HEADER_NAMES] for row in data]
+            formatted_data = [list(_GET_FIELDS(row)) for row in data]
 
-            csv_string = "\n".join([",".join(HEADER_NAMES)] + [",".join(map(str, row)) for row in formatted_data])
-            logging.info("CSV Output:\n" + csv_string)
+            csv_string = self._format_csv(formatted_data)
+            logger.debug("CSV Output:\n%s", csv_string)
 
             return formatted_data, HEADER_NAMES, csv_string
 
         except Exception as e:
-            logging.error(f"Error fetching formatted goals: {e}")
+            logger.error("Error fetching formatted goals: %s", e)
             return [], [], "An unexpected error occurred while fetching goals."
 
+    @synchronized
     def mark_goal_complete(self, goal: Goal) -> str:
         """
         Marks the specified goal as completed.
@@ -164,24 +283,25 @@ class CSVStorage(GoalStorage):
             str: A message indicating whether the goal was successfully marked as completed 
              or if it was not found or already completed.
         """
-        data = self._load_goals()
-        updated = False
-
-        for row in data:
-            if row["Goal"] == goal.sanitized_name and row["Status"] != "Completed":
-                row["Status"] = "Completed"
-                row["Completed At"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                if row["Completed At"]:
-                    row["Duration"] = str(datetime.strptime(row["Completed At"], "%Y-%m-%d %H:%M:%S") - datetime.strptime(row["Created At"], "%Y-%m-%d %H:%M:%S"))
-                updated = True
-                break
-
-        if not updated:
+        row_idx = self._find_row(goal.sanitized_name)
+        if row_idx is None or self._goals[row_idx]["Status"] == "Completed":
             return f"Goal '{goal.display_name}' not found or already completed."
 
-        self._save_goals(data)
+        new_row = dict(self._goals[row_idx])
+        new_row["Status"] = "Completed"
+        # Timestamps are stored in TIMESTAMP_FORMAT, an ISO 8601 layout that fromisoformat
+        # parses far faster than strptime.
+        now = datetime.now().replace(microsecond=0)
+        new_row["Completed At"] = now.strftime(TIMESTAMP_FORMAT)
+        try:
+            new_row["Duration"] = str(now - datetime.fromisoformat(new_row["Created At"]))
+        except (TypeError, ValueError):
+            # Created At is missing or was edited into another format
+            new_row["Duration"] = ""
+        self._rewrite_row(row_idx, new_row)
         return f"Goal '{goal.display_name}' marked as completed!"
 
+    @synchronized
     def delete_goal(self, goal: Goal) -> str:
         """
         Deletes a goal from the stored goals.
@@ -193,44 +313,26 @@ class CSVStorage(GoalStorage):
         Returns:
             str: A message indicating whether the goal was successfully deleted or not.
         """
-        data = self._load_goals()
-        new_data = [row for row in data if row["Goal"] != goal.sanitized_name]
-
-        if len(new_data) == len(data):
+        row_idx = self._find_row(goal.sanitized_name)
+        if row_idx is None:
             return f"Goal '{goal.display_name}' not found."
 
-        self._save_goals(new_data)
+        self._delete_row(row_idx)
         return f"Goal '{goal.display_name}' has been deleted successfully."
     
-    def update_goal_fields(storage: GoalStorage, goal_name: str, updates: dict) -> str:
-        """
-        Updates multiple fields for a goal.
-
-        Args:
-            storage (GoalStorage): The storage backend (GoogleSheetsStorage or CSVStorage).
-            goal_name (str): The display name of the goal to update, or a phrase that is semantically equivalent.
-            updates (dict): A dictionary where keys are field names and values are new values.
-
-        Returns:
-            str: Success or error message.
-        """
-        # Validate fields
-        invalid_fields = [field for field in updates.keys() if field not in HEADER_NAMES]
-        if invalid_fields:
-            return f"Invalid fields: {', '.join(invalid_fields)}. Allowed fields: {', '.join(HEADER_NAMES)}"
-
-        data = storage._load_goals()
-        updated = False
-
-        for row in data:
-            if row["Goal"] == Goal(goal_name).sanitized_name:
-                for field_name, new_value in updates.items():
-                    row[field_name] = new_value  # ✅ Update each specified field
-                updated = True
-                break
-
-        if not updated:
-            return f"Goal '{goal_name}' not found."
-
-        storage._save_goals(data)  # Save the updated data
-        return f"Goal '{goal_name}' updated: " + ", ".join(f"{k} → {v}" for k, v in updates.items())
+    @synchronized
+    def _goal_exists(self, goal: Goal) -> bool:
+        """Checks whether the goal is stored, ignoring letter case."""
+        return self._find_row(goal.sanitized_name) is not None
+
+    @synchronized
+    def _update_fields(self, goal: Goal, updates: Dict[str, str]) -> bool:
+        """Applies field updates to the goal's row and persists the change."""
+        row_idx = self._find_row(goal.sanitized_name)
+        if row_idx is None:
+            return False
+
+        new_row = dict(self._goals[row_idx])
+        new_row.update(updates)
+        self._rewrite_row(row_idx, new_row)
+        return True
@@ -1,3 +1,36 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def _sanitize(goal_display_name: str) -> str:
+    """Cached implementation of ``Goal._sanitize_goal_name``.
+
+    The same goal names are sanitized repeatedly within a single tool turn,
+    so results are memoized by display name.
+    """
+    if not goal_display_name:
+        raise ValueError("Goal name cannot be empty.")
+
+    return f"'{goal_display_name}'"
+
+
+def goal_key(sanitized_name: str) -> str:
+    """Returns the key under which a stored goal name is indexed.
+
+    Names that differ only in letter case map to the same key, so
+    "Read a book" and "read a Book" are treated as the same goal.
+
+    Args:
+        sanitized_name (str): A goal name as stored, i.e. already sanitized.
+
+    Returns:
+        str: The case-folded name.
+    """
+    return sanitized_name.casefold()
+
+
+@dataclass(frozen=True)
 class Goal:
     """Represents a user goal with sanitized storage and display formatting.
 
@@ -5,50 +38,53 @@ class Goal:
     and a storage-safe sanitized version. It handles sanitization to prevent security issues
     like formula injection in spreadsheet storage while maintaining readable output for users.
 
+    Instances are immutable and slotted (no per-instance ``__dict__``). Create them
+    from user input with ``Goal.from_raw``.
+
     Attributes:
         display_name (str): The original goal name as entered by the user.
         sanitized_name (str): Storage-safe version of the goal name, wrapped in quotes.
 
     Example:
-        >>> goal = Goal("Complete project by Friday")
+        >>> goal = Goal.from_raw("Complete project by Friday")
         >>> print(goal.display_name)
         'Complete project by Friday'
         >>> print(goal.sanitized_name)
         "'Complete project by Friday'"
-
-    Note:
-        The class includes a copy constructor pattern that should be reviewed as it may
-        indicate architectural issues in the codebase.
     """
 
-    def __init__(self, name: str) -> None:
-        """Initialize a new Goal instance.
+    # Declared by hand rather than with dataclass(slots=True), which requires Python 3.10
+    __slots__ = ("display_name", "sanitized_name")
+
+    display_name: str
+    sanitized_name: str
+
+    @classmethod
+    def from_raw(cls, name: str) -> "Goal":
+        """Create a Goal from a raw goal name.
 
         Args:
             name (str): The goal name or description to store.
 
+        Returns:
+            Goal: The goal, with surrounding whitespace removed from the display name.
+
         Raises:
             ValueError: If name is empty, None, or not a string.
-            TypeError: If name is a Goal instance (indicates potential code issue).
 
         Example:
-            >>> goal = Goal("Read War and Peace")
+            >>> goal = Goal.from_raw("  Read War and Peace ")
             >>> print(goal.display_name)
             Read War and Peace
         """
-        if isinstance(name, Goal):
-            # Copy constructor pattern - may indicate design issues
-            self.display_name = name.display_name
-            self.sanitized_name = name.sanitized_name
-            return
-        
         if not isinstance(name, str) or not name.strip():
             raise ValueError("Goal name must be a non-empty string")
-        
-        self.display_name = name.strip()
-        self.sanitized_name = self._sanitize_goal_name(self.display_name)
 
-    def _sanitize_goal_name(self, goal_display_name: str) -> str:
+        display_name = name.strip()
+        return cls(display_name, cls._sanitize_goal_name(display_name))
+
+    @staticmethod
+    def _sanitize_goal_name(goal_display_name: str) -> str:
         """Sanitizes the goal name for safe storage.
 
         Wraps the goal name in single quotes to prevent formula injection in
@@ -65,14 +101,16 @@ class Goal:
             ValueError: If goal is empty or None.
 
         Example:
-            >>> goal = Goal("=SUM(A1:A10)")  # Potentially unsafe formula
+            >>> goal = Goal.from_raw("=SUM(A1:A10)")  # Potentially unsafe formula
             >>> print(goal.sanitized_name)
             "'=SUM(A1:A10)'"  # Safely stored as text
         """
-        if not goal_display_name:
-            raise ValueError("Goal name cannot be empty.")
-        
-        return f"'{goal_display_name}'"
+        return _sanitize(goal_display_name)
+
+    @property
+    def key(self) -> str:
+        """str: Case-insensitive lookup key for the goal; see ``goal_key``."""
+        return goal_key(self.sanitized_name)
 
     def strip(self) -> str:
         """Returns the display version of the goal name.
@@ -85,7 +123,7 @@ class Goal:
             str: The unsanitized display name of the goal.
 
         Example:
-            >>> goal = Goal("My Goal")
+            >>> goal = Goal.from_raw("My Goal")
             >>> print(goal.strip())
             'My Goal'
         """
@@ -1,8 +1,29 @@
+import csv
+import functools
+import io
 from abc import ABC, abstractmethod
-from typing import List
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
 
+from priv_goals.constants import HEADER_NAMES
 from priv_goals.storage.goal import Goal
 
+# Field names accepted by update_goal_fields
+_HEADER_FIELDS = frozenset(HEADER_NAMES)
+
+def synchronized(method):
+    """Runs a storage method while holding the instance's ``_lock``.
+
+    Gradio sessions share one storage instance and run their turns on
+    separate worker threads, so backends use this to guard read-modify-write
+    sequences.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class GoalStorage(ABC):
     """Abstract base class defining the interface for goal storage backends.
@@ -32,6 +53,40 @@ class GoalStorage(ABC):
                 pass
     """
 
+    @staticmethod
+    def _format_csv(rows: List[List[str]]) -> str:
+        """Serializes goal rows, preceded by the header row, as a CSV string.
+
+        Fields containing commas, quotes or newlines are quoted.
+
+        Args:
+            rows (List[List[str]]): Goal rows ordered like ``HEADER_NAMES``.
+
+        Returns:
+            str: The CSV representation of the rows.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(HEADER_NAMES)
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    @contextmanager
+    def batched_writes(self) -> Iterator["GoalStorage"]:
+        """Groups the writes made through the yielded storage into as few requests as possible.
+
+        Backends with per-request overhead may yield a handle that defers
+        writes until the block exits; only writes made through that handle
+        are deferred. The default implementation yields this storage, which
+        writes immediately.
+
+        Example:
+            >>> with storage.batched_writes() as batch:
+            ...     batch.mark_goal_complete(Goal.from_raw("Learn Python"))
+            ...     batch.mark_goal_complete(Goal.from_raw("Read a book"))
+        """
+        yield self
+
     @abstractmethod
     def log_goal(self, goal: str) -> str:
         """Creates and stores a new goal.
@@ -82,7 +137,7 @@ class GoalStorage(ABC):
             str: Success message or not found/already complete message.
 
         Example:
-            >>> storage.mark_goal_complete(Goal("Learn Python"))
+            >>> storage.mark_goal_complete(Goal.from_raw("Learn Python"))
             'Goal "Learn Python" marked as completed!'
         """
         pass
@@ -98,22 +153,68 @@ class GoalStorage(ABC):
             str: Success message or not found message.
 
         Example:
-            >>> storage.delete_goal(Goal("Abandoned Task"))
+            >>> storage.delete_goal(Goal.from_raw("Abandoned Task"))
             'Goal "Abandoned Task" has been deleted successfully.'
         """
         pass
     
+    def update_goal_fields(self, goal: Goal, updates: Dict[str, str]) -> str:
+        """Updates multiple fields for a goal.
+
+        Field names are validated here; backends write the new values through
+        ``_update_fields``. A new "Goal" value is sanitized like a logged goal
+        and must not name another existing goal.
+
+        Args:
+            goal (Goal): The goal to update.
+            updates (Dict[str, str]): Maps field names from ``HEADER_NAMES`` to new values.
+
+        Returns:
+            str: Success or error message.
+
+        Example:
+            >>> storage.update_goal_fields(Goal.from_raw("Learn Python"), {"Notes": "Chapter 3"})
+            "Goal 'Learn Python' updated: Notes → Chapter 3"
+        """
+        invalid_fields = [field for field in updates if field not in _HEADER_FIELDS]
+        if invalid_fields:
+            return f"Invalid fields: {', '.join(invalid_fields)}. Allowed fields: {', '.join(HEADER_NAMES)}"
+
+        stored_updates = updates
+        if "Goal" in updates:
+            renamed = Goal.from_raw(updates["Goal"])
+            if renamed.key != goal.key and self._goal_exists(renamed):
+                return f"Goal '{renamed.display_name}' already exists!"
+            # Store the new name the way log_goal does, so it can be looked up again
+            stored_updates = {**updates, "Goal": renamed.sanitized_name}
+            updates = {**updates, "Goal": renamed.display_name}
+
+        if not self._update_fields(goal, stored_updates):
+            return f"Goal '{goal.display_name}' not found."
+
+        return f"Goal '{goal.display_name}' updated: " + ", ".join(f"{k} → {v}" for k, v in updates.items())
+
     @abstractmethod
-    def update_goal_fields(self, goal_name: str, updates: dict) -> str:
+    def _goal_exists(self, goal: Goal) -> bool:
+        """Checks whether a goal with the same name is stored.
+
+        Args:
+            goal (Goal): The goal to look for; names match case-insensitively.
+
+        Returns:
+            bool: True if the goal exists.
         """
-        Updates multiple fields for a goal.
+        pass
+
+    @abstractmethod
+    def _update_fields(self, goal: Goal, updates: Dict[str, str]) -> bool:
+        """Writes already-validated field updates to a goal's row.
 
         Args:
-            storage (GoalStorage): The storage backend (GoogleSheetsStorage or CSVStorage).
-            goal_name (str): The display name of the goal to update, or a phrase that is semantically equivalent.
-            updates (dict): A dictionary where keys are field names and values are new values.
+            goal (Goal): The goal to update.
+            updates (Dict[str, str]): Maps field names from ``HEADER_NAMES`` to new values.
 
         Returns:
-            str: Success or error message.
+            bool: True if the goal was found and updated, False if it does not exist.
         """
         pass
@@ -1,13 +1,103 @@
-
-
+import functools
 import logging
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from contextlib import contextmanager
+import threading
+import time
 from datetime import datetime
-from typing import List, Tuple
-from priv_goals.constants import HEADER_NAMES
-from priv_goals.storage.goal_storage import GoalStorage
-from priv_goals.storage.goal import Goal
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+from priv_goals.constants import HEADER_NAMES, TIMESTAMP_FORMAT
+from priv_goals.storage.goal_storage import GoalStorage, synchronized
+from priv_goals.storage.goal import Goal, goal_key
+
+if TYPE_CHECKING:
+    # gspread and google-auth are imported lazily so that CSV-only setups
+    # never pay for loading them.
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+logger = logging.getLogger(__name__)
+
+# Access tokens issued for service accounts expire after an hour; refresh the
+# cached worksheet handle a little before that.
+SHEET_HANDLE_TTL = 50 * 60
+
+# How long the goal-name -> row-number index is trusted before it is reloaded
+# from the sheet. Edits made outside the app are picked up after this window.
+INDEX_TTL = 30
+
+# How long a full-sheet read is reused before fetching it again. Writes made
+# through this storage invalidate it immediately.
+RECORDS_TTL = 10
+
+# Every data row, one column per HEADER_NAMES entry (e.g. "A2:G")
+_DATA_RANGE = f"A2:{chr(ord('A') + len(HEADER_NAMES) - 1)}"
+
+# Field name -> column letter, e.g. "Status" -> "B"
+_COLUMN_LETTERS = {name: chr(ord("A") + col) for col, name in enumerate(HEADER_NAMES)}
+
+# 0-based positions, within a row's values, of the columns read directly
+_GOAL_COL = HEADER_NAMES.index("Goal")
+_STATUS_COL = HEADER_NAMES.index("Status")
+_CREATED_AT_COL = HEADER_NAMES.index("Created At")
+
+# Retries for Sheets API requests that hit rate limiting or a transient server
+# error, with exponential backoff between attempts. Idempotent requests (reads
+# and cell updates) are retried on any of SHEETS_API_RETRY_STATUSES; appends and
+# row deletions only on SHEETS_API_REJECTED_STATUSES, which the server returns
+# without applying the request.
+SHEETS_API_RETRIES = 5
+SHEETS_API_BACKOFF = 0.3
+SHEETS_API_RETRY_STATUSES = (429, 500, 502, 503, 504)
+SHEETS_API_REJECTED_STATUSES = (429,)
+
+SCOPE = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+
+
+def _reauthenticate_on_401(method):
+    """Retries a sheet operation once with a fresh handle if the token was rejected."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        from gspread.exceptions import APIError
+
+        try:
+            return method(self, *args, **kwargs)
+        except APIError as e:
+            if e.response.status_code != 401:
+                raise
+            logger.info("Google Sheets rejected credentials, re-authenticating")
+            self._sheet = None
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _retry_write(request: Callable[[], Any], idempotent: bool = False) -> Any:
+    """Sends a write request, retrying it with backoff on transient failures.
+
+    Reads are retried by the session's urllib3 ``Retry`` instead (see
+    ``GoogleSheetsStorage._configure_session``), which never resends POSTs.
+
+    Args:
+        request: Zero-argument callable that performs the request.
+        idempotent: Whether resending the request after a 5xx is harmless.
+            Appends and row deletions are not: the first attempt may have been
+            applied, so only a 429 (rejected outright) is retried for them.
+
+    Returns:
+        The request's return value.
+    """
+    from gspread.exceptions import APIError
+
+    statuses = SHEETS_API_RETRY_STATUSES if idempotent else SHEETS_API_REJECTED_STATUSES
+    for attempt in range(SHEETS_API_RETRIES + 1):
+        try:
+            return request()
+        except APIError as e:
+            if attempt == SHEETS_API_RETRIES or e.response.status_code not in statuses:
+                raise
+            delay = SHEETS_API_BACKOFF * 2 ** attempt
+            logger.debug("Sheets write failed with %s, retrying in %.1fs", e.response.status_code, delay)
+            time.sleep(delay)
+
 
 class GoogleSheetsStorage(GoalStorage):
     """Google Sheets implementation of goal storage.
@@ -53,83 +143,432 @@ class GoogleSheetsStorage(GoalStorage):
         """
         self.credentials_path = credentials_path
         self.sheet_name = sheet_name
+        self._creds: Optional["Credentials"] = None
+        self._sheet: Optional["gspread.Worksheet"] = None
+        self._sheet_ts: float = 0.0
+        # Maps goal keys (case-folded sanitized names) to 1-based sheet row numbers
+        self._index: Dict[str, int] = {}
+        # Exact goal names -> row numbers, only for names whose key is shared
+        # by several rows, e.g. 'Read' and 'read' logged before names were
+        # matched case-insensitively
+        self._exact_rows: Dict[str, int] = {}
+        self._index_ts: float = 0.0
+        self._records: List[List[str]] = []
+        self._records_ts: Optional[float] = None
+        # Guards the row index and operations that address rows by number,
+        # which a concurrent delete would shift.
+        self._lock = threading.Lock()
 
-    def _setup_google_sheets(self) -> gspread.Worksheet:
+    def _setup_google_sheets(self) -> "gspread.Worksheet":
         """
         Authenticates and connects to the Google Sheet.
 
+        The worksheet handle is cached and reused until it is older than
+        ``SHEET_HANDLE_TTL`` seconds, so only the first call pays for the OAuth
+        exchange and spreadsheet lookup.
+
         Returns:
             gspread.Worksheet: The first worksheet of the specified Google Sheet.
         """
+        if self._sheet is not None and time.monotonic() - self._sheet_ts < SHEET_HANDLE_TTL:
+            return self._sheet
+
         try:
-            scope = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
-            creds = ServiceAccountCredentials.from_json_keyfile_name(self.credentials_path, scope)
-            client = gspread.authorize(creds)
-            sheet = client.open(self.sheet_name).sheet1
-            return sheet
+            import gspread
+            from google.oauth2.service_account import Credentials
+
+            if self._creds is None:
+                # The credentials object refreshes its own access token, so the
+                # keyfile only needs to be parsed once. gspread uses google-auth
+                # credentials as-is, without converting them on each authorize.
+                self._creds = Credentials.from_service_account_file(self.credentials_path, scopes=SCOPE)
+            client = gspread.authorize(self._creds)
+            self._configure_session(client)
+            self._sheet = client.open(self.sheet_name).sheet1
+            self._sheet_ts = time.monotonic()
+            return self._sheet
         except Exception as e:
             raise RuntimeError(f"Error setting up Google Sheets: {e}")
 
-    def log_goal(self, goal: str) -> str:
-        goal_obj: Goal = Goal(goal)  # Convert raw string to Goal
+    @staticmethod
+    def _configure_session(client: "gspread.Client") -> None:
+        """Mounts a pooled, retrying adapter on the client's HTTP session.
+
+        Connections to the Sheets API are kept alive across requests, and
+        idempotent requests are retried with backoff on 429 and 5xx responses.
+        Writes (POST) are not retried, so an append is never sent twice.
+        """
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # gspread 6 moved the session onto client.http_client
+        session = getattr(client, "http_client", client).session
+        retry = Retry(
+            total=SHEETS_API_RETRIES,
+            backoff_factor=SHEETS_API_BACKOFF,
+            status_forcelist=SHEETS_API_RETRY_STATUSES,
+            raise_on_status=False
+        )
+        session.mount("https://", HTTPAdapter(max_retries=retry))
+
+    def _load_goals(self) -> List[List[str]]:
+        """Returns all goal rows, reusing a read younger than ``RECORDS_TTL``.
+
+        Rows are read with a single values request over ``_DATA_RANGE`` and
+        hold one string per ``HEADER_NAMES`` column; trailing empty cells,
+        which the API omits, are filled with empty strings.
+        """
+        if self._records_ts is None or time.monotonic() - self._records_ts >= RECORDS_TTL:
+            sheet = self._setup_google_sheets()
+            width = len(HEADER_NAMES)
+            self._records = [
+                row[:width] + [""] * (width - len(row))
+                for row in sheet.get(_DATA_RANGE)
+                if row
+            ]
+            self._records_ts = time.monotonic()
+        return self._records
+
+    def _invalidate_records(self) -> None:
+        """Forces the next ``_load_goals`` call to read the sheet again."""
+        self._records_ts = None
+
+    @contextmanager
+    def batched_writes(self) -> Iterator[GoalStorage]:
+        """Yields a handle that defers the appends and cell updates made through it.
+
+        The deferred writes are queued on the handle rather than on this
+        storage, which all Gradio sessions share, so each block sends only its
+        own writes when it exits: new goals with a single append_rows and cell
+        updates with a single batch_update. Row deletions are still applied
+        immediately, after flushing the handle's pending writes, since they
+        shift the rows those writes address.
+        """
+        batch = _SheetsWriteBatch(self)
+        try:
+            yield batch
+        finally:
+            with self._lock:
+                self._flush_batch(batch)
+
+    def _flush_batch(self, batch: "_SheetsWriteBatch") -> None:
+        """Sends a batch's deferred appends, then its cell updates. Caller must hold the lock.
+
+        Both queues are taken before anything is sent, so a failed append does
+        not leave the batch's updates behind for a later flush to apply.
+        """
+        rows, batch.rows = batch.rows, []
+        updates, batch.updates = batch.updates, []
+        if rows:
+            sheet = self._setup_google_sheets()
+            index = self._get_index(sheet)
+            # Another session may have logged the same goal since it was queued
+            rows = [row for row in rows if goal_key(row[_GOAL_COL]) not in index]
+            if rows:
+                self._append_rows(sheet, rows)
+        if updates:
+            self._send_field_updates(self._setup_google_sheets(), updates)
+
+    @staticmethod
+    def _cell_updates(row: int, fields: Dict[str, str]) -> List[Dict]:
+        """Builds batch_update entries setting the named fields of one row."""
+        return [
+            {"range": f"{_COLUMN_LETTERS[field_name]}{row}", "values": [[value]]}
+            for field_name, value in fields.items()
+        ]
+
+    def _send_updates(self, sheet: "gspread.Worksheet", updates: List[Dict]) -> None:
+        """Writes cell updates with one batch_update.
+
+        Setting cells to fixed values is idempotent, so the request is retried
+        after a 429 or a 5xx.
+        """
+        _retry_write(functools.partial(sheet.batch_update, updates), idempotent=True)
+        self._invalidate_records()
+
+    def _send_field_updates(self, sheet: "gspread.Worksheet", updates: List[Tuple[str, Dict[str, str]]]) -> None:
+        """Writes field updates addressed by stored goal name with one batch_update.
+
+        Rows are looked up in the index only now, so updates deferred by a
+        batch still land on the right rows if another session deleted rows
+        above them in the meantime.
+        """
+        cell_updates: List[Dict] = []
+        for name, fields in updates:
+            row = self._lookup_row(sheet, name)
+            if row is None:
+                logger.warning("Dropping update for goal %r, which no longer exists", name)
+                continue
+            cell_updates.extend(self._cell_updates(row, fields))
+        if not cell_updates:
+            return
+
+        self._send_updates(sheet, cell_updates)
+        if any("Goal" in fields for _, fields in updates):
+            # A goal was renamed; rebuild the index on next lookup
+            self._index_ts = 0.0
+
+    def _append_rows(self, sheet: "gspread.Worksheet", rows: List[List[str]]) -> None:
+        """Appends goal rows in one request and records their row numbers in the index."""
+        response = _retry_write(functools.partial(sheet.append_rows, rows))
+        self._invalidate_records()
+
+        from gspread.utils import a1_to_rowcol
+
+        # e.g. "Sheet1!A5:C6" -> first appended row is 5
+        updated_range = response["updates"]["updatedRange"].split("!")[-1]
+        first_row = a1_to_rowcol(updated_range.split(":")[0])[0]
+        for offset, row in enumerate(rows):
+            self._index[goal_key(row[_GOAL_COL])] = first_row + offset
+
+    def _refresh_index(self, sheet: "gspread.Worksheet") -> None:
+        """Rebuilds the goal-name -> row-number index from the Goal column."""
+        names = sheet.col_values(_GOAL_COL + 1)[1:]
+        self._index = {}
+        ambiguous_keys = set()
+        for row, name in enumerate(names, start=2):
+            key = goal_key(name)
+            if key in self._index:
+                ambiguous_keys.add(key)
+            else:
+                self._index[key] = row
+        self._exact_rows = {}
+        if ambiguous_keys:
+            for row, name in enumerate(names, start=2):
+                if goal_key(name) in ambiguous_keys:
+                    self._exact_rows.setdefault(name, row)
+        self._index_ts = time.monotonic()
+
+    def _get_index(self, sheet: "gspread.Worksheet") -> Dict[str, int]:
+        """Returns the row index, reloading it if it is older than ``INDEX_TTL``."""
+        if time.monotonic() - self._index_ts >= INDEX_TTL:
+            self._refresh_index(sheet)
+        return self._index
+
+    def _lookup_row(self, sheet: "gspread.Worksheet", name: str) -> Optional[int]:
+        """Returns the indexed row of a goal name, without reading the row.
+
+        Names are matched case-insensitively, except that a row stored under
+        exactly ``name`` wins when several rows differ only in case.
+        """
+        index = self._get_index(sheet)
+        row = self._exact_rows.get(name)
+        return row if row is not None else index.get(goal_key(name))
+
+    def _find_row(
+        self, sheet: "gspread.Worksheet", goal: Goal, batch: Optional["_SheetsWriteBatch"] = None
+    ) -> Optional[Tuple[int, List[str]]]:
+        """Locates a goal's row, verifying the cached position against the sheet.
+
+        Returns:
+            Optional[Tuple[int, List[str]]]: The row number and the row's values,
+                or None if the goal does not exist.
+        """
+        if batch is not None and any(goal_key(pending[_GOAL_COL]) == goal.key for pending in batch.rows):
+            # Logged earlier in this batch; write it so it has a row to address
+            self._flush_batch(batch)
+
+        row = self._lookup_row(sheet, goal.sanitized_name)
+        if row is not None:
+            values = sheet.row_values(row)
+            if len(values) > _GOAL_COL and goal_key(values[_GOAL_COL]) == goal.key:
+                return row, values
+
+        # The cached position is missing or stale; reload once and retry.
+        self._refresh_index(sheet)
+        row = self._lookup_row(sheet, goal.sanitized_name)
+        if row is None:
+            return None
+        return row, sheet.row_values(row)
+
+    @_reauthenticate_on_401
+    @synchronized
+    def log_goal(self, goal: str, batch: Optional["_SheetsWriteBatch"] = None) -> str:
+        goal_obj: Goal = Goal.from_raw(goal)  # Convert raw string to Goal
 
-        # sheet: gspread.Worksheet = self._setup_google_sheets()
-        # data: List[dict] = sheet.get_all_records()
-        
         sheet = self._setup_google_sheets()
-        data = sheet.get_all_records()
+        index = self._get_index(sheet)
 
-        if any(row["Goal"] == goal_obj.sanitized_name for row in data):
+        if goal_obj.key in index or (batch is not None and any(
+            goal_key(pending[_GOAL_COL]) == goal_obj.key for pending in batch.rows
+        )):
             return f"Goal '{goal_obj.display_name}' already exists!"
 
-        timestamp: str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        sheet.append_row([goal_obj.sanitized_name, "Pending", timestamp])
+        timestamp: str = time.strftime(TIMESTAMP_FORMAT)
+        row = [goal_obj.sanitized_name, "Pending", timestamp]
+        if batch is not None:
+            batch.rows.append(row)
+        else:
+            self._append_rows(sheet, [row])
 
         return f"Goal '{goal_obj.display_name}' logged successfully!"
     
-    def view_goals_formatted(self) -> Tuple[List[List[str]], List[str], str]:
+    def view_goals_formatted(
+        self, batch: Optional["_SheetsWriteBatch"] = None
+    ) -> Tuple[List[List[str]], List[str], str]:
         """
         Returns goals in a formatted way for the DataFrame display and CSV representation.
 
+        Args:
+            batch: Write batch whose deferred writes should be visible in the result.
+
         Returns:
             Tuple[List[List[str]], List[str], str]: (Formatted data for Gradio, Column headers, CSV string)
         """
+        if batch is not None:
+            with self._lock:
+                self._flush_batch(batch)
+
         try:
             # TODO: Move common logic to a shared method
             data = self._load_goals()
             if not data:
                 return [], [], "No goals found."
 
-            formatted_data = [[row[header_name] for header_name in HEADER_NAMES] for row in data]
+            formatted_data = [list(row) for row in data]
 
-            csv_string = "\n".join([",".join(HEADER_NAMES)] + [",".join(map(str, row)) for row in formatted_data])
-            logging.info("CSV Output:\n" + csv_string)
+            csv_string = self._format_csv(formatted_data)
+            logger.debug("CSV Output:\n%s", csv_string)
 
             return formatted_data, HEADER_NAMES, csv_string
 
         except Exception as e:
-            logging.error(f"Error fetching formatted goals: {e}")
+            logger.error("Error fetching formatted goals: %s", e)
             return [], [], "An unexpected error occurred while fetching goals."
         
 
-    def mark_goal_complete(self, goal: Goal) -> str:
-        sheet: gspread.Worksheet = self._setup_google_sheets()
-        data: List[dict] = sheet.get_all_records()
+    @_reauthenticate_on_401
+    @synchronized
+    def mark_goal_complete(self, goal: Goal, batch: Optional["_SheetsWriteBatch"] = None) -> str:
+        sheet: "gspread.Worksheet" = self._setup_google_sheets()
+        found = self._find_row(sheet, goal, batch)
+        if found is None:
+            return f"Goal '{goal.display_name}' not found or already completed."
 
-        for i, row in enumerate(data, start=2):  # Start at 2 for header
-            if row["Goal"] == goal.sanitized_name and row["Status"] != "Completed":
-                sheet.update_cell(i, 2, "Completed")
-                return f"Goal '{goal.display_name}' marked as completed!"
+        _, values = found
+        stored_name = values[_GOAL_COL]
+        if batch is not None:
+            # The row as it will be once the batch's earlier updates are sent
+            values = batch.pending_values(values)
+        if values[_STATUS_COL:_STATUS_COL + 1] == ["Completed"]:
+            return f"Goal '{goal.display_name}' not found or already completed."
 
-        return f"Goal '{goal.display_name}' not found or already completed."
+        now = datetime.now().replace(microsecond=0)
+        completed_at = now.strftime(TIMESTAMP_FORMAT)
+        try:
+            duration = str(now - datetime.fromisoformat(values[_CREATED_AT_COL]))
+        except (IndexError, TypeError, ValueError):
+            # Created At is missing, unparseable, or carries a UTC offset
+            duration = ""
+
+        # Status, Completed At and Duration in a single request
+        updates = (stored_name, {
+            "Status": "Completed",
+            "Completed At": completed_at,
+            "Duration": duration,
+        })
+        if batch is not None:
+            batch.updates.append(updates)
+        else:
+            self._send_field_updates(sheet, [updates])
+        return f"Goal '{goal.display_name}' marked as completed!"
+
+    @_reauthenticate_on_401
+    @synchronized
+    def delete_goal(self, goal: Goal, batch: Optional["_SheetsWriteBatch"] = None) -> str:
+        sheet: "gspread.Worksheet" = self._setup_google_sheets()
+        found = self._find_row(sheet, goal, batch)
+
+        if found is None:
+            return f"Goal '{goal.display_name}' not found."
+
+        if batch is not None:
+            # Write the batch's deferred updates before the rows below shift
+            self._flush_batch(batch)
+
+        deleted_row, values = found
+        _retry_write(functools.partial(sheet.delete_rows, deleted_row))
+        self._invalidate_records()
+
+        if values[_GOAL_COL] in self._exact_rows:
+            # Other rows share this goal's key; rebuild the index on next lookup
+            self._index_ts = 0.0
+        else:
+            # Patch the index instead of reloading it: rows below shift up by one.
+            del self._index[goal.key]
+            for rows in (self._index, self._exact_rows):
+                for name, row in rows.items():
+                    if row > deleted_row:
+                        rows[name] = row - 1
+
+        return f"Goal '{goal.display_name}' has been deleted successfully."
+
+    @_reauthenticate_on_401
+    @synchronized
+    def _goal_exists(self, goal: Goal, batch: Optional["_SheetsWriteBatch"] = None) -> bool:
+        if batch is not None and any(goal_key(pending[_GOAL_COL]) == goal.key for pending in batch.rows):
+            return True
+        return self._lookup_row(self._setup_google_sheets(), goal.sanitized_name) is not None
+
+    @_reauthenticate_on_401
+    @synchronized
+    def _update_fields(
+        self, goal: Goal, updates: Dict[str, str], batch: Optional["_SheetsWriteBatch"] = None
+    ) -> bool:
+        sheet: "gspread.Worksheet" = self._setup_google_sheets()
+        found = self._find_row(sheet, goal, batch)
+
+        if found is None:
+            return False
+
+        _, values = found
+        if batch is not None:
+            batch.updates.append((values[_GOAL_COL], updates))
+        else:
+            self._send_field_updates(sheet, [(values[_GOAL_COL], updates)])
+        return True
+
+
+class _SheetsWriteBatch(GoalStorage):
+    """Write handle yielded by ``GoogleSheetsStorage.batched_writes``.
+
+    Holds the block's deferred goal rows and field updates, so that exiting
+    the block sends only the writes made through this handle.
+    """
+
+    def __init__(self, storage: GoogleSheetsStorage) -> None:
+        self._storage = storage
+        self.rows: List[List[str]] = []
+        # (stored goal name, fields) pairs; rows are resolved from the index when sent
+        self.updates: List[Tuple[str, Dict[str, str]]] = []
+
+    def pending_values(self, values: List[str]) -> List[str]:
+        """Returns a copy of a sheet row with this batch's deferred updates to it applied."""
+        stored_name = values[_GOAL_COL]
+        values = list(values)
+        for name, fields in self.updates:
+            if name != stored_name:
+                continue
+            for field_name, value in fields.items():
+                col = HEADER_NAMES.index(field_name)
+                values += [""] * (col + 1 - len(values))
+                values[col] = value
+        return values
+
+    def log_goal(self, goal: str) -> str:
+        return self._storage.log_goal(goal, batch=self)
+
+    def view_goals_formatted(self) -> Tuple[List[List[str]], List[str], str]:
+        return self._storage.view_goals_formatted(batch=self)
+
+    def mark_goal_complete(self, goal: Goal) -> str:
+        return self._storage.mark_goal_complete(goal, batch=self)
 
     def delete_goal(self, goal: Goal) -> str:
-        sheet: gspread.Worksheet = self._setup_google_sheets()
-        data: List[dict] = sheet.get_all_records()
+        return self._storage.delete_goal(goal, batch=self)
 
-        for i, row in enumerate(data, start=2):
-            if row["Goal"] == goal.sanitized_name:
-                sheet.delete_rows(i)
-                return f"Goal '{goal.display_name}' has been deleted successfully."
+    def _goal_exists(self, goal: Goal) -> bool:
+        return self._storage._goal_exists(goal, batch=self)
 
-        return f"Goal '{goal.display_name}' not found."
+    def _update_fields(self, goal: Goal, updates: Dict[str, str]) -> bool:
+        return self._storage._update_fields(goal, updates, batch=self)